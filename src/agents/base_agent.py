@@ -5,7 +5,7 @@ This module provides a standardized base agent with common functionality.
 """
 
 import logging
-from typing import List, Optional, Dict, Any, Union, AsyncGenerator
+from typing import List, Optional, Dict, Any, Union, AsyncGenerator, Iterable, Iterator
 from typing_extensions import override
 
 from google.adk.agents import BaseAgent as ADKBaseAgent
@@ -262,9 +262,9 @@ class BaseAgent(ADKBaseAgent):
             session_id=session_id,
         )
 
-    def run(self, user_id: str, session_id: str, message: Union[str, types.Content]) -> List[Any]:
+    def _iter_events(self, user_id: str, session_id: str, message: Union[str, types.Content]) -> Iterator[Any]:
         """
-        Run the agent with a message.
+        Run the agent with a message, streaming events as the runner produces them.
 
         Args:
             user_id: The ID of the user.
@@ -272,7 +272,7 @@ class BaseAgent(ADKBaseAgent):
             message: The message to send to the agent.
 
         Returns:
-            A list of events from the agent.
+            An iterator over the events from the agent.
         """
         # Reason: We automatically create a session if it doesn't exist to simplify the API
         # and reduce errors for developers interacting with the agent
@@ -287,15 +287,28 @@ class BaseAgent(ADKBaseAgent):
         # Reason: Using the runner instead of directly calling run_async allows us to
         # handle the async-to-sync conversion and event collection automatically
         logger.info(f"Running agent: {self.name} for user: {user_id}, session: {session_id}")
-        events = list(self._runner.run(user_id=user_id, session_id=session_id, new_message=message))
-        return events
+        return self._runner.run(user_id=user_id, session_id=session_id, new_message=message)
+
+    def run(self, user_id: str, session_id: str, message: Union[str, types.Content]) -> List[Any]:
+        """
+        Run the agent with a message.
+
+        Args:
+            user_id: The ID of the user.
+            session_id: The ID of the session.
+            message: The message to send to the agent.
+
+        Returns:
+            A list of events from the agent.
+        """
+        return list(self._iter_events(user_id, session_id, message))
 
-    def get_final_response(self, events: List[Any]) -> Optional[str]:
+    def get_final_response(self, events: Iterable[Any]) -> Optional[str]:
         """
-        Extract the final response from a list of events.
+        Extract the final response from a sequence of events.
 
         Args:
-            events: A list of events from the agent.
+            events: The events from the agent, as a list or a live event stream.
 
         Returns:
             The final response text, or None if there is no final response.
@@ -303,10 +316,17 @@ class BaseAgent(ADKBaseAgent):
         # Reason: We scan through all events to find the final response,
         # ignoring intermediate events (like function calls) to get just the
         # final text response to present to the user
+        found = False
+        response = None
         for event in events:
-            if event.is_final_response() and event.content and event.content.parts:
-                return event.content.parts[0].text
-        return None
+            # Reason: A live stream is drained to the end even after the first final
+            # response; abandoning Runner.run's generator early cancels the invocation,
+            # so later events (e.g. other sub-agents' final responses) would never be
+            # persisted to the session
+            if not found and event.is_final_response() and event.content and event.content.parts:
+                response = event.content.parts[0].text
+                found = True
+        return response
 
     def run_and_get_response(self, user_id: str, session_id: str, message: Union[str, types.Content]) -> Optional[str]:
         """
@@ -322,6 +342,7 @@ class BaseAgent(ADKBaseAgent):
         """
         # Reason: This convenience method combines running the agent and extracting
         # the final response for simpler integration in applications that just need
-        # the final text response rather than processing all events
-        events = self.run(user_id, session_id, message)
+        # the final text response rather than processing all events. The event stream
+        # is scanned as it arrives instead of being collected into a list first.
+        events = self._iter_events(user_id, session_id, message)
         return self.get_final_response(events)
@@ -139,8 +139,8 @@ def run_agent(
         print("Please specify a query with --query or run in interactive mode with --interactive")
 
 
-def main():
-    """Run the command-line interface."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the command-line interface."""
     # Create the argument parser
     parser = argparse.ArgumentParser(description="Google ADK Agent Starter Kit CLI")
     
@@ -168,6 +168,13 @@ def main():
     # Add the config command
     config_parser = subparsers.add_parser("config", help="Print the current configuration")
     
+    return parser
+
+
+def main():
+    """Run the command-line interface."""
+    parser = _build_parser()
+    
     # Parse the arguments
     args = parser.parse_args()
     
@@ -193,10 +200,5 @@ def main():
         parser.print_help()
 
 
-# For test coverage only - do not use in production code
-def _test_main_block():
-    """Helper function for testing the __name__ == '__main__' block."""
-    main()
-
 if __name__ == "__main__":
     main()
@@ -124,12 +124,17 @@ def main():
         
         # Update chat.py with the new Agent Engine ID
         chat_script_path = "chat.py"
-        if os.path.isfile(chat_script_path):
-            logger.info(f"Updating {chat_script_path} with new Agent Engine ID: {agent_engine_id}")
-            
+        # Reason: Opening the script directly and handling FileNotFoundError avoids a
+        # separate isfile() stat, and can't race with the file being removed in between
+        try:
             # Read the chat script
             with open(chat_script_path, "r") as f:
                 content = f.read()
+        except FileNotFoundError:
+            content = None
+        
+        if content is not None:
+            logger.info(f"Updating {chat_script_path} with new Agent Engine ID: {agent_engine_id}")
             
             # Create a backup
             backup_path = f"{chat_script_path}.{uuid.uuid4().hex}.bak"
@@ -6,7 +6,7 @@ This module provides utilities for running agents locally for development and te
 
 import logging
 import os
-from typing import Any, Optional, Dict, Union, List
+from typing import Any, Optional, Dict, Union, List, Tuple
 
 import uvicorn
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
@@ -23,6 +23,27 @@ from ..utils.logging import get_logger
 # Configure logging
 logger = get_logger(__name__)
 
+# Web UI asset directories, resolved once at import rather than per app
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+_TEMPLATES_DIR = os.path.join(_MODULE_DIR, "templates")
+_STATIC_DIR = os.path.join(_MODULE_DIR, "static")
+
+# Paths of the routes create_app registers
+_INDEX_PATH = "/"
+_SESSIONS_PATH = "/api/sessions/{user_id}"
+_HISTORY_PATH = "/api/sessions/{user_id}/{session_id}/history"
+_CHAT_PATH = "/api/chat"
+_WEBSOCKET_PATH = "/ws/{user_id}/{session_id}"
+
+# (method, path) of every route create_app registers, in registration order
+_ROUTE_SPECS = (
+    ("GET", _INDEX_PATH),
+    ("GET", _SESSIONS_PATH),
+    ("GET", _HISTORY_PATH),
+    ("POST", _CHAT_PATH),
+    ("WEBSOCKET", _WEBSOCKET_PATH),
+)
+
 
 class Message(BaseModel):
     """Model for a message sent to the agent."""
@@ -31,6 +52,16 @@ class Message(BaseModel):
     session_id: str = "session"
 
 
+def _route_specs() -> Tuple[Tuple[str, str], ...]:
+    """
+    Get the routes create_app registers, without building an app.
+
+    Returns:
+        A tuple of (method, path) pairs, where method is an HTTP method or "WEBSOCKET".
+    """
+    return _ROUTE_SPECS
+
+
 def create_app(agent: Any) -> FastAPI:
     """
     Create a FastAPI application for the agent.
@@ -43,26 +74,20 @@ def create_app(agent: Any) -> FastAPI:
     """
     app = FastAPI(title=f"{agent.name} API", description=f"API for {agent.name}")
 
-    # Get the templates directory path
-    templates_dir = os.path.join(os.path.dirname(__file__), "templates")
-    
-    # Get the static directory path
-    static_dir = os.path.join(os.path.dirname(__file__), "static")
-
     # Mount static files
-    app.mount("/static", StaticFiles(directory=static_dir), name="static")
+    app.mount("/static", StaticFiles(directory=_STATIC_DIR), name="static")
 
     # Set up templates
-    templates = Jinja2Templates(directory=templates_dir)
+    templates = Jinja2Templates(directory=_TEMPLATES_DIR)
 
-    @app.get("/", response_class=HTMLResponse)
+    @app.get(_INDEX_PATH, response_class=HTMLResponse)
     async def get_index(request: Request):
         """Serve the chat interface."""
         return templates.TemplateResponse(
             "index.html", {"request": request, "agent_name": agent.name}
         )
 
-    @app.get("/api/sessions/{user_id}", response_class=JSONResponse)
+    @app.get(_SESSIONS_PATH, response_class=JSONResponse)
     async def list_user_sessions(user_id: str):
         """List all session IDs for a given user."""
         try:
@@ -115,7 +140,7 @@ def create_app(agent: Any) -> FastAPI:
             logger.error(f"Error listing sessions for user {user_id}: {e}", exc_info=True)
             return JSONResponse(status_code=500, content={"error": "Failed to list sessions"})
 
-    @app.get("/api/sessions/{user_id}/{session_id}/history", response_class=JSONResponse)
+    @app.get(_HISTORY_PATH, response_class=JSONResponse)
     async def get_session_history(user_id: str, session_id: str):
         """Get the chat history (events) for a specific session."""
         try:
@@ -173,7 +198,7 @@ def create_app(agent: Any) -> FastAPI:
             return JSONResponse(status_code=500, content={"error": "Failed to get session history"})
 
 
-    @app.post("/api/chat", response_class=JSONResponse)
+    @app.post(_CHAT_PATH, response_class=JSONResponse)
     async def chat(message: Message):
         """Handle chat messages."""
         logger.info(f"Received message: {message.text}")
@@ -187,7 +212,7 @@ def create_app(agent: Any) -> FastAPI:
         
         return {"response": response or "No response from the agent."}
 
-    @app.websocket("/ws/{user_id}/{session_id}")
+    @app.websocket(_WEBSOCKET_PATH)
     async def websocket_endpoint(websocket: WebSocket, user_id: str, session_id: str):
         """Handle WebSocket connections for streaming responses."""
         await websocket.accept()
@@ -8,9 +8,22 @@ using the official Vertex AI Python SDK.
 
 import os
 import sys
-import argparse
+import datetime
+import importlib.util
 import logging
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from typing import List, Dict, Any, Optional, Tuple
+
+import cloudpickle
+
+def _module_available(name):
+    """Check whether a module can be imported without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:
+        # Reason: find_spec raises rather than returning None when a parent package is missing
+        return False
 
 # Configure logging
 logging.basicConfig(
@@ -19,6 +32,172 @@ logging.basicConfig(
 )
 logger = logging.getLogger("sdk_agent_deploy")
 
+# Storage clients keyed by project ID, reused across initialize_vertexai calls
+_STORAGE_CLIENTS: Dict[str, Any] = {}
+
+def _get_storage_client(project_id):
+    """Get the cached Cloud Storage client for a project, creating it on first use."""
+    client = _STORAGE_CLIENTS.get(project_id)
+    if client is None:
+        from google.cloud import storage
+        client = _STORAGE_CLIENTS[project_id] = storage.Client(project=project_id)
+    return client
+
+# Models for the test agent, in order of preference
+_PREFERRED_MODELS = ["gemini-1.5-flash", "gemini-1.0-pro", "gemini-pro", "gemini-flash"]
+
+# Model resolved for each (project_id, location)
+_MODEL_CACHE: Dict[Tuple[str, str], str] = {}
+
+def _resolve_model(project_id, location):
+    """Pick the most preferred Gemini model that is available in the target region."""
+    key = (project_id, location)
+    if key in _MODEL_CACHE:
+        return _MODEL_CACHE[key]
+    
+    model = _PREFERRED_MODELS[0]
+    try:
+        from google import genai
+        
+        # One listing call up front is far cheaper than a failed Agent Engine deploy
+        client = genai.Client(vertexai=True, project=project_id, location=location)
+        available = [m.name.rsplit("/", 1)[-1] for m in client.models.list(config={"query_base": True})]
+    except Exception as e:
+        # Reason: The failure may be transient (auth, network), so the fallback is
+        # not cached and the next call lists the models again
+        logger.warning("Could not list available models, defaulting to %s: %s", model, e)
+        return model
+    
+    for preferred in _PREFERRED_MODELS:
+        if any(name.startswith(preferred) for name in available):
+            model = preferred
+            break
+    else:
+        logger.warning("None of %s found in %s, defaulting to %s", _PREFERRED_MODELS, location, model)
+    
+    _MODEL_CACHE[key] = model
+    return model
+
+def get_weather(city: str) -> dict:
+    """Retrieves the current weather report for a specified city."""
+    if city.lower() == "new york":
+        return {
+            "status": "success",
+            "report": (
+                "The weather in New York is sunny with a temperature of 25 degrees"
+                " Celsius (77 degrees Fahrenheit)."
+            ),
+        }
+    else:
+        return {
+            "status": "error",
+            "error_message": f"Weather information for '{city}' is not available.",
+        }
+
+# IANA timezone names known to get_current_time, keyed by lower-cased city name
+_CITY_TZ_NAMES = {"new york": "America/New_York"}
+
+# Timezones loaded by _get_timezone, keyed by IANA name
+_TZ_CACHE: Dict[str, Any] = {}
+
+def _get_timezone(name):
+    """
+    Get a timezone by IANA name, loading it on first use.
+    
+    Returns:
+        The timezone, or None if zoneinfo or its time zone data is unavailable
+    """
+    tz = _TZ_CACHE.get(name)
+    if tz is None:
+        # Reason: Only get_current_time needs time zones, so a missing zoneinfo
+        # backport or tzdata must not break importing this module for list/delete
+        try:
+            # Check if zoneinfo is available (Python 3.9+)
+            if _module_available("zoneinfo"):
+                from zoneinfo import ZoneInfo
+            else:
+                # Fallback for Python < 3.9
+                from backports.zoneinfo import ZoneInfo
+            tz = _TZ_CACHE[name] = ZoneInfo(name)
+        except (ImportError, KeyError) as e:
+            # ZoneInfoNotFoundError is a KeyError; failures are not cached
+            logger.warning("Could not load timezone %s: %s", name, e)
+    return tz
+
+def get_current_time(city: str) -> dict:
+    """Returns the current time in a specified city."""
+    tz_name = _CITY_TZ_NAMES.get(city.lower())
+    tz = _get_timezone(tz_name) if tz_name is not None else None
+    if tz is None:
+        return {
+            "status": "error",
+            "error_message": (
+                f"Sorry, I don't have timezone information for {city}."
+            ),
+        }
+
+    now = datetime.datetime.now(tz)
+    report = (
+        f'The current time in {city} is {now.strftime("%Y-%m-%d %H:%M:%S %Z%z")}'
+    )
+    return {"status": "success", "report": report}
+
+# Tools given to the test agent, defined once at import instead of per deploy
+_TOOLS = (get_weather, get_current_time)
+
+# Reason: The tools are module-level functions, which cloudpickle would otherwise
+# pickle by reference to this module; the Agent Engine runtime doesn't have it
+# installed, so ship their code by value instead
+cloudpickle.register_pickle_by_value(sys.modules[__name__])
+
+_UPGRADE_HINT = "Please upgrade with: pip install --upgrade google-cloud-aiplatform[adk,agent_engines]"
+
+def _fail(msg: str, exc: Optional[BaseException] = None, code: Optional[int] = None):
+    """
+    Report an error once, through the log.
+    
+    The logging.basicConfig handler above already writes to stderr with the
+    ERROR level name, so the message is not echoed separately.
+    
+    Args:
+        msg: Description of what failed
+        exc: The exception that caused the failure, if any
+        code: Exit status; when given, the process exits after reporting
+    """
+    if exc is not None:
+        logger.error("%s: %s", msg, exc)
+    else:
+        logger.error("%s", msg)
+    if code is not None:
+        sys.exit(code)
+
+def _print_deploy_summary(agent_id, project_id):
+    """Print the post-deployment summary and follow-up commands in a single write."""
+    sys.stdout.writelines([
+        "\nAgent successfully deployed!\n",
+        f"Agent ID: {agent_id}\n",
+        "\nTo test your agent, use:\n",
+        f"python sdk_agent_deploy.py test --agent-id {agent_id} --project-id {project_id}\n",
+        "\nTo delete your agent when finished, use:\n",
+        f"python sdk_agent_deploy.py delete --agent-id {agent_id} --project-id {project_id}\n",
+    ])
+    sys.stdout.flush()
+
+def _ensure_staging_bucket(project_id, location):
+    """Create the project's staging bucket if it doesn't exist yet; failures are only logged."""
+    bucket_name = f"{project_id}-vertex-agents"
+    try:
+        client = _get_storage_client(project_id)
+        
+        # Check if bucket exists
+        if not client.bucket(bucket_name).exists():
+            logger.info("Creating staging bucket: gs://%s", bucket_name)
+            # Try to create the bucket
+            client.create_bucket(bucket_name, location=location)
+    except Exception as e:
+        logger.warning("Could not verify or create staging bucket: %s", e)
+        logger.warning("Deployment may fail if the bucket doesn't exist")
+
 def initialize_vertexai(project_id=None, location="us-central1"):
     """Initialize the Vertex AI SDK."""
     try:
@@ -46,39 +225,32 @@ def initialize_vertexai(project_id=None, location="us-central1"):
             if not project_id:
                 raise ValueError("No project ID provided and couldn't determine from environment")
                 
-        logger.info(f"Initializing Vertex AI with project: {project_id}, location: {location}")
+        logger.info("Initializing Vertex AI with project: %s, location: %s", project_id, location)
         
         # Create a default staging bucket name based on the project ID
         staging_bucket = f"gs://{project_id}-vertex-agents"
         
-        # Try to ensure the bucket exists
-        try:
-            from google.cloud import storage
-            client = storage.Client(project=project_id)
+        # Reason: vertexai.init only records SDK state and doesn't need the bucket
+        # to exist yet (only uploads do), so run it while the storage RPCs are in flight
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            bucket_future = executor.submit(_ensure_staging_bucket, project_id, location)
             
-            # Check if bucket exists
-            if not client.bucket(f"{project_id}-vertex-agents").exists():
-                logger.info(f"Creating staging bucket: {staging_bucket}")
-                # Try to create the bucket
-                client.create_bucket(f"{project_id}-vertex-agents", location=location)
-        except Exception as e:
-            logger.warning(f"Could not verify or create staging bucket: {e}")
-            logger.warning("Deployment may fail if the bucket doesn't exist")
-        
-        # Initialize Vertex AI with the staging bucket
-        vertexai.init(
-            project=project_id,
-            location=location,
-            staging_bucket=staging_bucket,
-        )
+            # Initialize Vertex AI with the staging bucket
+            vertexai.init(
+                project=project_id,
+                location=location,
+                staging_bucket=staging_bucket,
+            )
+            bucket_future.result()
         
         return project_id, location
     except ImportError:
-        logger.error("Vertex AI SDK not installed. Please install it with: pip install google-cloud-aiplatform[adk,agent_engines]")
-        sys.exit(1)
+        _fail("Vertex AI SDK not installed. Please install it with: pip install google-cloud-aiplatform[adk,agent_engines]", code=1)
     except Exception as e:
-        logger.error(f"Error initializing Vertex AI: {e}")
-        sys.exit(1)
+        _fail("Could not initialize Vertex AI", e, code=1)
+
+# Columns shown by list_agents, fetched in one call per agent
+_AGENT_FIELDS = attrgetter('name', 'display_name', 'status', 'create_time')
 
 def list_agents(project_id=None, location="us-central1"):
     """List all Agent Engines deployed in the project."""
@@ -90,46 +262,54 @@ def list_agents(project_id=None, location="us-central1"):
             # Import agent_engines
             from vertexai import agent_engines
             
-            logger.info(f"Listing Agent Engines in project {project_id}, location {location}")
+            logger.info("Listing Agent Engines in project %s, location %s", project_id, location)
             
             # List all agents - convert generator to list if needed
             agents_raw = agent_engines.list()
             agents = list(agents_raw) if hasattr(agents_raw, '__iter__') and not isinstance(agents_raw, list) else agents_raw
             
             if agents:
-                print("\nAgent Engines:")
-                print("=" * 80)
-                print(f"{'ID':<25} {'Display Name':<25} {'Status':<15} {'Creation Time'}")
-                print("-" * 80)
+                # Build the whole table first and write it in one call rather
+                # than paying a write (and possibly a flush) per line
+                lines = [
+                    "\nAgent Engines:\n",
+                    "=" * 80 + "\n",
+                    f"{'ID':<25} {'Display Name':<25} {'Status':<15} {'Creation Time'}\n",
+                    "-" * 80 + "\n",
+                ]
                 for agent in agents:
-                    agent_id = getattr(agent, 'name', 'N/A')
-                    display_name = getattr(agent, 'display_name', 'N/A')
-                    state = getattr(agent, 'status', 'Unknown')
-                    create_time = getattr(agent, 'create_time', 'N/A')
+                    try:
+                        agent_id, display_name, state, create_time = _AGENT_FIELDS(agent)
+                    except AttributeError:
+                        # Fall back to per-field defaults when the SDK object lacks a field
+                        agent_id = getattr(agent, 'name', 'N/A')
+                        display_name = getattr(agent, 'display_name', 'N/A')
+                        state = getattr(agent, 'status', 'Unknown')
+                        create_time = getattr(agent, 'create_time', 'N/A')
                     
-                    print(f"{agent_id:<25} {display_name:<25} {state:<15} {create_time}")
+                    lines.append(f"{agent_id:<25} {display_name:<25} {state:<15} {create_time}\n")
                 
-                agent_count = len(agents) if isinstance(agents, list) else "multiple"
-                logger.info(f"Found {agent_count} Agent Engines")
+                lines.extend([
+                    "\nTo test an agent, use:\n",
+                    f"python sdk_agent_deploy.py test --agent-id <AGENT_ID> --project-id {project_id}\n",
+                    "\nTo delete an agent, use:\n",
+                    f"python sdk_agent_deploy.py delete --agent-id <AGENT_ID> --project-id {project_id}\n",
+                ])
+                sys.stdout.writelines(lines)
+                sys.stdout.flush()
                 
-                print("\nTo test an agent, use:")
-                print(f"python sdk_agent_deploy.py test --agent-id <AGENT_ID> --project-id {project_id}")
-                print("\nTo delete an agent, use:")
-                print(f"python sdk_agent_deploy.py delete --agent-id <AGENT_ID> --project-id {project_id}")
+                agent_count = len(agents) if isinstance(agents, list) else "multiple"
+                logger.info("Found %s Agent Engines", agent_count)
             else:
                 print("No Agent Engines found.")
                 logger.info("No Agent Engines found")
                 print("\nTo deploy an Agent Engine, use:")
                 print(f"python sdk_agent_deploy.py deploy --name my-test-agent --project-id {project_id}")
         except ImportError:
-            logger.error("Agent Engine functionality not available in your Vertex AI SDK version.")
-            logger.error("Please upgrade with: pip install --upgrade google-cloud-aiplatform[adk,agent_engines]")
-            print("\nAgent Engine functionality not available in your Vertex AI SDK version.")
-            print("Please upgrade with: pip install --upgrade google-cloud-aiplatform[adk,agent_engines]")
+            _fail(f"Agent Engine functionality not available in your Vertex AI SDK version. {_UPGRADE_HINT}")
             
     except Exception as e:
-        logger.error(f"Error listing Agent Engines: {e}")
-        print(f"Error: {e}")
+        _fail("Could not list Agent Engines", e)
 
 def delete_agent(agent_id, project_id=None, location="us-central1", force=False):
     """Delete an Agent Engine."""
@@ -143,6 +323,11 @@ def delete_agent(agent_id, project_id=None, location="us-central1", force=False)
             
             # Confirm deletion if not forced
             if not force:
+                # Reason: input() blocks forever on a non-interactive stdin (CI, pipes),
+                # so refuse instead of hanging and require --force explicitly
+                if not sys.stdin.isatty():
+                    _fail("Refusing to prompt on non-TTY stdin; pass --force to delete")
+                    return
                 print(f"You are about to delete Agent Engine: {agent_id}")
                 confirmation = input("\nAre you sure you want to proceed? (y/N): ").lower()
                 if confirmation != 'y' and confirmation != 'yes':
@@ -150,7 +335,7 @@ def delete_agent(agent_id, project_id=None, location="us-central1", force=False)
                     print("Deletion cancelled.")
                     return
             
-            logger.info(f"Deleting Agent Engine with ID: {agent_id}")
+            logger.info("Deleting Agent Engine with ID: %s", agent_id)
             
             try:
                 # Get the agent
@@ -159,27 +344,23 @@ def delete_agent(agent_id, project_id=None, location="us-central1", force=False)
                 # Delete the agent
                 agent.delete(force=True)
                 
-                logger.info(f"Successfully deleted Agent Engine: {agent_id}")
+                logger.info("Successfully deleted Agent Engine: %s", agent_id)
                 print(f"Successfully deleted Agent Engine: {agent_id}")
             except Exception as e:
-                logger.error(f"Error with agent_engines.get/delete: {e}")
+                logger.error("Error with agent_engines.get/delete: %s", e)
                 print(f"Attempting alternative delete method...")
                 
                 # Try alternative method with delete function
                 agent_engines.delete(agent_id, force=True)
                 
-                logger.info(f"Successfully deleted Agent Engine using alternative method: {agent_id}")
+                logger.info("Successfully deleted Agent Engine using alternative method: %s", agent_id)
                 print(f"Successfully deleted Agent Engine: {agent_id}")
             
         except ImportError as e:
-            logger.error(f"Agent Engine functionality not available: {e}")
-            logger.error("Please upgrade with: pip install --upgrade google-cloud-aiplatform[adk,agent_engines]")
-            print("\nAgent Engine functionality not available in your Vertex AI SDK version.")
-            print("Please upgrade with: pip install --upgrade google-cloud-aiplatform[adk,agent_engines]")
+            _fail(f"Agent Engine functionality not available in your Vertex AI SDK version ({e}). {_UPGRADE_HINT}")
             
     except Exception as e:
-        logger.error(f"Error deleting Agent Engine: {e}")
-        print(f"Error: {e}")
+        _fail("Could not delete Agent Engine", e)
 
 def deploy_test_agent(name, project_id=None, location="us-central1"):
     """
@@ -191,26 +372,21 @@ def deploy_test_agent(name, project_id=None, location="us-central1"):
         
         try:
             # Import required modules
-            import datetime
             import importlib
             
-            # Check if zoneinfo is available (Python 3.9+)
-            try:
-                from zoneinfo import ZoneInfo
-            except ImportError:
-                # Fallback for Python < 3.9
-                from backports.zoneinfo import ZoneInfo
-                print("Using backports.zoneinfo for Python < 3.9")
-            
             # Check for different module paths
             adk_agent_module = None
             for module_path in ["google.adk.agents", "vertexai.preview.adk.agents"]:
+                if not _module_available(module_path):
+                    continue
+                # Reason: find_spec only proves a spec exists; a broken or partial
+                # install can still fail to import, so fall through to the next path
                 try:
                     adk_agent_module = importlib.import_module(module_path)
-                    logger.info(f"Found Agent module at: {module_path}")
-                    break
                 except ImportError:
                     continue
+                logger.info("Found Agent module at: %s", module_path)
+                break
             
             if not adk_agent_module:
                 raise ImportError("Could not find Google ADK Agent module")
@@ -227,47 +403,11 @@ def deploy_test_agent(name, project_id=None, location="us-central1"):
             # Import agent engines
             from vertexai import agent_engines
             
-            logger.info(f"Creating a simple test agent named: {name}")
+            logger.info("Creating a simple test agent named: %s", name)
             
-            # Define tool functions
-            def get_weather(city: str) -> dict:
-                """Retrieves the current weather report for a specified city."""
-                if city.lower() == "new york":
-                    return {
-                        "status": "success",
-                        "report": (
-                            "The weather in New York is sunny with a temperature of 25 degrees"
-                            " Celsius (77 degrees Fahrenheit)."
-                        ),
-                    }
-                else:
-                    return {
-                        "status": "error",
-                        "error_message": f"Weather information for '{city}' is not available.",
-                    }
-            
-            def get_current_time(city: str) -> dict:
-                """Returns the current time in a specified city."""
-                if city.lower() == "new york":
-                    tz_identifier = "America/New_York"
-                else:
-                    return {
-                        "status": "error",
-                        "error_message": (
-                            f"Sorry, I don't have timezone information for {city}."
-                        ),
-                    }
-            
-                tz = ZoneInfo(tz_identifier)
-                now = datetime.datetime.now(tz)
-                report = (
-                    f'The current time in {city} is {now.strftime("%Y-%m-%d %H:%M:%S %Z%z")}'
-                )
-                return {"status": "success", "report": report}
-            
-            # Get available models
-            available_models = ["gemini-1.5-flash", "gemini-1.0-pro", "gemini-pro", "gemini-flash"]
-            model_to_use = available_models[0]  # Default to first model
+            # Pick a model that is actually available in the target region
+            model_to_use = _resolve_model(project_id, location)
+            logger.info("Using model: %s", model_to_use)
             
             # Create the agent
             root_agent = Agent(
@@ -275,7 +415,7 @@ def deploy_test_agent(name, project_id=None, location="us-central1"):
                 model=model_to_use,
                 description="Agent to answer questions about the time and weather in a city.",
                 instruction="You are a helpful agent who can answer user questions about the time and weather in a city.",
-                tools=[get_weather, get_current_time],
+                tools=list(_TOOLS),
             )
             
             # Wrap the agent for Agent Engine
@@ -301,7 +441,7 @@ def deploy_test_agent(name, project_id=None, location="us-central1"):
                         elif isinstance(event, dict) and "parts" in event and event["parts"] and "text" in event["parts"][0]:
                             print(f"Agent response: {event['parts'][0]['text']}")
                 except Exception as e:
-                    logger.warning(f"Local test failed, but continuing with deployment: {e}")
+                    logger.warning("Local test failed, but continuing with deployment: %s", e)
                 
                 logger.info("Deploying agent to Vertex AI Agent Engine...")
                 print("\nDeploying to Vertex AI Agent Engine. This may take several minutes...")
@@ -317,18 +457,13 @@ def deploy_test_agent(name, project_id=None, location="us-central1"):
                 # Get the agent ID
                 agent_id = getattr(remote_app, "name", str(remote_app))
                 
-                logger.info(f"Agent successfully deployed with ID: {agent_id}")
-                print(f"\nAgent successfully deployed!")
-                print(f"Agent ID: {agent_id}")
-                print("\nTo test your agent, use:")
-                print(f"python sdk_agent_deploy.py test --agent-id {agent_id} --project-id {project_id}")
-                print("\nTo delete your agent when finished, use:")
-                print(f"python sdk_agent_deploy.py delete --agent-id {agent_id} --project-id {project_id}")
+                logger.info("Agent successfully deployed with ID: %s", agent_id)
+                _print_deploy_summary(agent_id, project_id)
                 
                 return agent_id
             
             except Exception as e:
-                logger.error(f"Error using AdkApp: {e}")
+                logger.error("Error using AdkApp: %s", e)
                 print(f"Trying alternative deployment method...")
                 
                 # Try another approach - use Application directly instead of AgentClient
@@ -337,32 +472,23 @@ def deploy_test_agent(name, project_id=None, location="us-central1"):
                 # Create Application directly
                 app = reasoning_engines.Application(
                     display_name=name,
-                    tools=[get_weather, get_current_time]
+                    tools=list(_TOOLS)
                 )
                 
                 # Deploy the application
                 deployed_app = app.deploy(machine_type="e2-standard-2")
                 
                 agent_id = deployed_app.name
-                logger.info(f"Agent successfully deployed with alternative method. ID: {agent_id}")
-                print(f"\nAgent successfully deployed!")
-                print(f"Agent ID: {agent_id}")
-                print("\nTo test your agent, use:")
-                print(f"python sdk_agent_deploy.py test --agent-id {agent_id} --project-id {project_id}")
-                print("\nTo delete your agent when finished, use:")
-                print(f"python sdk_agent_deploy.py delete --agent-id {agent_id} --project-id {project_id}")
+                logger.info("Agent successfully deployed with alternative method. ID: %s", agent_id)
+                _print_deploy_summary(agent_id, project_id)
                 
                 return agent_id
                 
         except ImportError as e:
-            logger.error(f"Missing required module: {e}")
-            logger.error("Please install with: pip install google-cloud-aiplatform[adk,agent_engines]")
-            print(f"\nMissing required module: {e}")
-            print("Please install with: pip install google-cloud-aiplatform[adk,agent_engines]")
+            _fail(f"Missing required module ({e}). Please install with: pip install google-cloud-aiplatform[adk,agent_engines]")
             
     except Exception as e:
-        logger.error(f"Error deploying Agent Engine: {e}")
-        print(f"Error: {e}")
+        _fail("Could not deploy Agent Engine", e)
 
 def test_agent(agent_id, project_id=None, location="us-central1"):
     """Test an existing agent by sending a query."""
@@ -374,7 +500,7 @@ def test_agent(agent_id, project_id=None, location="us-central1"):
             # Import agent_engines
             from vertexai import agent_engines
             
-            logger.info(f"Testing Agent Engine with ID: {agent_id}")
+            logger.info("Testing Agent Engine with ID: %s", agent_id)
             
             try:
                 # Get the agent
@@ -387,7 +513,7 @@ def test_agent(agent_id, project_id=None, location="us-central1"):
                 if not session_id:
                     raise ValueError("Could not get session ID")
                     
-                logger.info(f"Created session with ID: {session_id}")
+                logger.info("Created session with ID: %s", session_id)
                 
                 # Send a test query
                 print("\nSending test query to agent...")
@@ -408,7 +534,7 @@ def test_agent(agent_id, project_id=None, location="us-central1"):
                 logger.info("Test completed successfully")
                 
             except Exception as e:
-                logger.error(f"Error with standard test approach: {e}")
+                logger.error("Error with standard test approach: %s", e)
                 print(f"Attempting alternative test method...")
                 
                 # Try alternative method using client
@@ -432,17 +558,16 @@ def test_agent(agent_id, project_id=None, location="us-central1"):
                 logger.info("Test completed successfully with alternative method")
             
         except ImportError as e:
-            logger.error(f"Agent Engine functionality not available: {e}")
-            logger.error("Please upgrade with: pip install --upgrade google-cloud-aiplatform[adk,agent_engines]")
-            print("\nAgent Engine functionality not available in your Vertex AI SDK version.")
-            print("Please upgrade with: pip install --upgrade google-cloud-aiplatform[adk,agent_engines]")
+            _fail(f"Agent Engine functionality not available in your Vertex AI SDK version ({e}). {_UPGRADE_HINT}")
             
     except Exception as e:
-        logger.error(f"Error testing Agent Engine: {e}")
-        print(f"Error: {e}")
+        _fail("Could not test Agent Engine", e)
 
-def main(args=None):
-    """Main entry point for the script."""
+def _build_parser():
+    """Build the argument parser for the script."""
+    # Reason: imported here so importing this module (e.g. for its tools) stays light
+    import argparse
+    
     parser = argparse.ArgumentParser(description="Deploy and manage agents using Vertex AI SDK")
     subparsers = parser.add_subparsers(dest="command", help="Command to execute")
     
@@ -470,34 +595,37 @@ def main(args=None):
     test_parser.add_argument("--project-id", help="Google Cloud project ID")
     test_parser.add_argument("--location", default="us-central1", help="Google Cloud region (default: us-central1)")
     
-    parsed_args = parser.parse_args(args)
+    return parser
+
+# Parser built lazily by _get_parser on the first main() call, then reused by later calls
+_PARSER = None
+
+def _get_parser():
+    """Get the argument parser, building it on the first call."""
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    return _PARSER
+
+# Map each subcommand to its handler; argparse dests match the handler kwargs
+_CMDS = {
+    "list": list_agents,
+    "delete": delete_agent,
+    "deploy": deploy_test_agent,
+    "test": test_agent,
+}
+
+def main(args=None):
+    """Main entry point for the script."""
+    parser = _get_parser()
+    parsed_args = vars(parser.parse_args(args))
+    command = _CMDS.get(parsed_args.pop("command"))
     
-    if parsed_args.command == "list":
-        list_agents(
-            project_id=parsed_args.project_id,
-            location=parsed_args.location
-        )
-    elif parsed_args.command == "delete":
-        delete_agent(
-            agent_id=parsed_args.agent_id,
-            project_id=parsed_args.project_id,
-            location=parsed_args.location,
-            force=parsed_args.force
-        )
-    elif parsed_args.command == "deploy":
-        deploy_test_agent(
-            name=parsed_args.name,
-            project_id=parsed_args.project_id,
-            location=parsed_args.location
-        )
-    elif parsed_args.command == "test":
-        test_agent(
-            agent_id=parsed_args.agent_id,
-            project_id=parsed_args.project_id,
-            location=parsed_args.location
-        )
-    else:
+    if command is None:
         parser.print_help()
+        return
+    
+    command(**parsed_args)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
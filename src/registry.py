@@ -6,10 +6,14 @@ registered and used without modifying the CLI code directly.
 """
 
 import logging
-from typing import Any, Callable, Dict, Optional, Type
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Type
 
 from .utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from .agents.base_agent import BaseAgent
+
 # Configure logging
 logger = get_logger(__name__)
 
@@ -19,6 +23,16 @@ AgentFactory = Callable[..., Any]
 # Registry of agent types
 _agent_registry: Dict[str, AgentFactory] = {}
 
+# Reason: Registration is a check-then-set, so it is serialized to stay atomic
+# when agent types are registered from several threads
+_registry_lock = threading.Lock()
+
+# Sentinel for registry misses, so lookups need a single dict access
+_MISSING = object()
+
+# Whether the built-in agent types have been added to the registry yet
+_builtins_registered = False
+
 
 def register_agent_type(agent_type: str, factory: AgentFactory) -> None:
     """
@@ -31,10 +45,12 @@ def register_agent_type(agent_type: str, factory: AgentFactory) -> None:
     Raises:
         ValueError: If the agent type is already registered.
     """
-    if agent_type in _agent_registry:
-        raise ValueError(f"Agent type '{agent_type}' is already registered.")
-    
-    _agent_registry[agent_type] = factory
+    _register_builtins()
+    with _registry_lock:
+        if agent_type in _agent_registry:
+            raise ValueError(f"Agent type '{agent_type}' is already registered.")
+        
+        _agent_registry[agent_type] = factory
     logger.info(f"Registered agent type: {agent_type}")
 
 
@@ -51,10 +67,12 @@ def get_agent_factory(agent_type: str) -> AgentFactory:
     Raises:
         ValueError: If the agent type is not registered.
     """
-    if agent_type not in _agent_registry:
+    _register_builtins()
+    factory = _agent_registry.get(agent_type, _MISSING)
+    if factory is _MISSING:
         raise ValueError(f"Agent type '{agent_type}' is not registered.")
     
-    return _agent_registry[agent_type]
+    return factory
 
 
 def create_agent(
@@ -100,13 +118,12 @@ def list_agent_types() -> list:
     Returns:
         A list of registered agent types.
     """
+    _register_builtins()
     return list(_agent_registry.keys())
 
 
 # Register built-in agent types
-from .agents.base_agent import BaseAgent # Import BaseAgent
 # Removed: from .agents.search_agent import SearchAgent
-from google.adk.tools import google_search # Import the search tool
 
 def _create_base_agent(
     name: Optional[str] = None,
@@ -114,8 +131,13 @@ def _create_base_agent(
     description: Optional[str] = None,
     instruction: Optional[str] = None,
     **kwargs
-) -> BaseAgent:
+) -> "BaseAgent":
     """Factory function for creating a base agent."""
+    # Reason: ADK and the agent module are imported on first use so that importing
+    # the registry (and every CLI command) doesn't pay for them up front
+    from .agents.base_agent import BaseAgent
+    from google.adk.tools import google_search
+
     # Note: BaseAgent might require specific tools or config depending on usage
     return BaseAgent(
         name=name or "base_agent", # Give it a default name
@@ -128,6 +150,17 @@ def _create_base_agent(
 
 # Removed _create_search_agent function
 
-# Register the agent types
-register_agent_type("base", _create_base_agent)
-# Removed: register_agent_type("search", _create_search_agent)
+def _register_builtins() -> None:
+    """Register the built-in agent types, once, on first use of the registry."""
+    # Reason: Deferring this from import time keeps importing the registry free of
+    # side effects, and the flag makes every later call a no-op
+    global _builtins_registered
+    if _builtins_registered:
+        return
+    
+    with _registry_lock:
+        if _builtins_registered:
+            return
+        _agent_registry["base"] = _create_base_agent
+        _builtins_registered = True
+    logger.info("Registered built-in agent types")
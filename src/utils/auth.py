@@ -4,9 +4,9 @@ Authentication utilities for the Google ADK Agent Starter Kit.
 This module provides utilities for authenticating with Google services.
 """
 
-import os
+import functools
 import logging
-from typing import Optional
+from typing import Optional, Tuple
 
 import google.auth
 from google.oauth2 import service_account
@@ -17,6 +17,33 @@ from ..config import GOOGLE_API_KEY, GOOGLE_APPLICATION_CREDENTIALS, USE_VERTEX_
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Scopes requested when the caller doesn't specify any
+DEFAULT_SCOPES = ("https://www.googleapis.com/auth/cloud-platform",)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_service_account_credentials(
+    path: str, scopes: Tuple[str, ...]
+) -> google.auth.credentials.Credentials:
+    """
+    Load service account credentials from a file, cached per path and scopes.
+
+    Args:
+        path: Path to the service account file.
+        scopes: The scopes to request.
+
+    Returns:
+        The credentials loaded from the file.
+
+    Raises:
+        Exception: Whatever the loader raises; failures are not cached.
+    """
+    # Reason: Credentials refresh in place, so one object per file can be shared
+    # across calls instead of re-reading and re-parsing the key file every time.
+    # Logged here because this body only runs on a cache miss, when a load happens
+    logger.info(f"Loading credentials from service account file: {path}")
+    return service_account.Credentials.from_service_account_file(path, scopes=list(scopes))
+
 
 def get_credentials(
     scopes: Optional[list] = None,
@@ -38,34 +65,32 @@ def get_credentials(
         The credentials, or None if no credentials could be obtained.
     """
     credentials = None
-    scopes = scopes or ["https://www.googleapis.com/auth/cloud-platform"]
+    scopes = tuple(scopes or DEFAULT_SCOPES)
 
+    # Reason: Opening the file directly and handling FileNotFoundError replaces a
+    # separate existence check, saving a stat call per source
     # Try to get credentials from the provided service account file
-    if service_account_file and os.path.exists(service_account_file):
+    if service_account_file:
         try:
-            logger.info(f"Loading credentials from service account file: {service_account_file}")
-            credentials = service_account.Credentials.from_service_account_file(
-                service_account_file, scopes=scopes
-            )
-            return credentials
+            return _load_service_account_credentials(service_account_file, scopes)
+        except FileNotFoundError:
+            logger.debug(f"Service account file not found: {service_account_file}")
         except Exception as e:
             logger.warning(f"Failed to load credentials from service account file: {e}")
 
     # Try to get credentials from the GOOGLE_APPLICATION_CREDENTIALS environment variable
-    if GOOGLE_APPLICATION_CREDENTIALS and os.path.exists(GOOGLE_APPLICATION_CREDENTIALS):
+    if GOOGLE_APPLICATION_CREDENTIALS:
         try:
-            logger.info(f"Loading credentials from GOOGLE_APPLICATION_CREDENTIALS: {GOOGLE_APPLICATION_CREDENTIALS}")
-            credentials = service_account.Credentials.from_service_account_file(
-                GOOGLE_APPLICATION_CREDENTIALS, scopes=scopes
-            )
-            return credentials
+            return _load_service_account_credentials(GOOGLE_APPLICATION_CREDENTIALS, scopes)
+        except FileNotFoundError:
+            logger.debug(f"GOOGLE_APPLICATION_CREDENTIALS file not found: {GOOGLE_APPLICATION_CREDENTIALS}")
         except Exception as e:
             logger.warning(f"Failed to load credentials from GOOGLE_APPLICATION_CREDENTIALS: {e}")
 
     # Try to get application default credentials
     try:
         logger.info("Loading application default credentials")
-        credentials, project = google.auth.default(scopes=scopes)
+        credentials, project = google.auth.default(scopes=list(scopes))
         return credentials
     except Exception as e:
         logger.warning(f"Failed to load application default credentials: {e}")
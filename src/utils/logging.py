@@ -4,10 +4,13 @@ Logging utilities for the Google ADK Agent Starter Kit.
 This module provides utilities for configuring logging.
 """
 
+import atexit
 import logging
+import queue
 import sys
 import os
-from typing import Optional, Union, TextIO
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple, Union, TextIO
 
 from ..config import LOG_LEVEL, DEV_MODE
 
@@ -17,12 +20,104 @@ DEFAULT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 # Development log format (more verbose)
 DEV_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
 
+# Format used when none is given; DEV_MODE is fixed at import, so choose once
+_DEFAULT_FORMAT = DEV_FORMAT if DEV_MODE else DEFAULT_FORMAT
+
+# Formatters keyed by format string, shared across configure_logging calls
+_FORMATTER_CACHE: Dict[str, logging.Formatter] = {}
+
+# Arguments and root handlers installed by the last configure_logging call
+_LAST_CONFIG: Optional[Tuple[tuple, list]] = None
+
+# Loggers configure_logging adjusts; logger objects live for the whole process
+_ROOT_LOGGER = logging.getLogger()
+_ADK_LOGGER = logging.getLogger("google.adk")
+_PACKAGE_LOGGER = logging.getLogger("src")
+
+# Background listener writing queued records when configured with use_queue
+_QUEUE_LISTENER: Optional[QueueListener] = None
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    File handler that opens its file on first use and writes through a large buffer.
+
+    Unlike logging.FileHandler, which flushes after every record, records are
+    only flushed when one at or above flush_level is logged, on an explicit
+    flush(), and when the handler is closed (including at interpreter exit).
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        mode: str = "a",
+        encoding: Optional[str] = None,
+        buffer_size: int = 64 * 1024,
+        flush_level: int = logging.WARNING,
+    ):
+        """
+        Initialize the handler without opening the file.
+
+        Args:
+            filename: Path to the log file.
+            mode: The mode to open the file with (default: append).
+            encoding: The file encoding (default: platform default).
+            buffer_size: Size in bytes of the file's write buffer.
+            flush_level: Records at or above this level are flushed immediately.
+        """
+        self.buffer_size = buffer_size
+        self.flush_level = flush_level
+        self._defer_flush = False
+        super().__init__(filename, mode=mode, encoding=encoding, delay=True)
+
+    def _open(self):
+        """Open the log file with a large write buffer."""
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a record, leaving it in the buffer unless it is severe enough to flush."""
+        # Reason: StreamHandler.emit calls flush() after every write; deferring it
+        # here lets low-severity records accumulate in the buffer
+        self._defer_flush = record.levelno < self.flush_level
+        try:
+            super().emit(record)
+        finally:
+            self._defer_flush = False
+
+    def flush(self) -> None:
+        """Flush the buffer, unless called from emit for a low-severity record."""
+        if not self._defer_flush:
+            super().flush()
+
+
+def _stop_queue_listener() -> None:
+    """Stop the background listener, writing out queued records, and close its handlers."""
+    global _QUEUE_LISTENER
+    listener, _QUEUE_LISTENER = _QUEUE_LISTENER, None
+    if listener is None:
+        return
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+# Reason: Registered after logging's own shutdown hook, so it runs first and the
+# queue is drained before logging flushes and closes the remaining handlers
+atexit.register(_stop_queue_listener)
+
 
 def configure_logging(
     level: Optional[Union[int, str]] = None,
     format_string: Optional[str] = None,
     log_file: Optional[str] = None,
     stream: Optional[TextIO] = None,
+    use_queue: bool = False,
 ) -> None:
     """
     Configure logging for the application.
@@ -32,6 +127,8 @@ def configure_logging(
         format_string: The log format string (default: based on DEV_MODE).
         log_file: Path to a log file (default: None).
         stream: Stream to log to (default: sys.stdout).
+        use_queue: Hand records to a background thread that writes them, so
+            logging threads never block on stream or file I/O (default: False).
     """
     # Get log level from config if not provided
     if level is None:
@@ -43,60 +140,95 @@ def configure_logging(
     
     # Get format string based on DEV_MODE if not provided
     if format_string is None:
-        format_string = DEV_FORMAT if DEV_MODE else DEFAULT_FORMAT
+        format_string = _DEFAULT_FORMAT
+    
+    # Reason: sys.stdout is looked up per call, not at import, so redirected or
+    # captured stdout (e.g. in tests) is honoured
+    if stream is None:
+        stream = sys.stdout
+    
+    # Reason: Reconfiguring with identical arguments would only tear down and
+    # rebuild the same handlers (reopening any log file), so skip it as long as
+    # nobody has changed the root logger since our last call
+    global _LAST_CONFIG, _QUEUE_LISTENER
+    root_logger = _ROOT_LOGGER
+    signature = (level, format_string, log_file, id(stream), use_queue)
+    if (
+        _LAST_CONFIG is not None
+        and _LAST_CONFIG[0] == signature
+        and root_logger.handlers == _LAST_CONFIG[1]
+        and root_logger.level == level
+        and _ADK_LOGGER.level == level
+        and _PACKAGE_LOGGER.level == level
+    ):
+        return
     
     # Configure root logger
-    root_logger = logging.getLogger()
     root_logger.setLevel(level)
     
     # Remove existing handlers
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
+    # Reason: Swapping in a fresh list detaches every handler in one step instead of
+    # copying the list and calling removeHandler (a linear scan) for each of them,
+    # and avoids relying on logging's private module lock
+    root_logger.handlers = []
+    # Reason: Only the handlers our last call installed are closed; any others
+    # (e.g. pytest's capture handlers or ones a caller attached) aren't ours to close
+    if _LAST_CONFIG is not None:
+        for handler in _LAST_CONFIG[1]:
+            handler.close()
+    _stop_queue_listener()
     
-    # Create formatter
-    formatter = logging.Formatter(format_string)
+    # Get or create the formatter
+    formatter = _FORMATTER_CACHE.get(format_string)
+    if formatter is None:
+        formatter = _FORMATTER_CACHE[format_string] = logging.Formatter(format_string)
     
     # Add stream handler
-    if stream is None:
-        stream = sys.stdout
-    
     stream_handler = logging.StreamHandler(stream)
     stream_handler.setFormatter(formatter)
-    root_logger.addHandler(stream_handler)
+    handlers = [stream_handler]
     
     # Add file handler if log_file is provided
     if log_file:
         # Create directory if it doesn't exist
         log_dir = os.path.dirname(log_file)
-        if log_dir and not os.path.exists(log_dir):
-            os.makedirs(log_dir)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
         
-        file_handler = logging.FileHandler(log_file)
+        file_handler = BufferedFileHandler(log_file)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    if use_queue:
+        # Reason: Emitting threads only pay for a queue put; formatting and I/O
+        # happen on the listener's thread
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(QueueHandler(log_queue))
+        _QUEUE_LISTENER = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _QUEUE_LISTENER.start()
+    else:
+        for handler in handlers:
+            root_logger.addHandler(handler)
+    
+    _LAST_CONFIG = (signature, list(root_logger.handlers))
     
     # Configure google.adk logger
-    adk_logger = logging.getLogger("google.adk")
+    adk_logger = _ADK_LOGGER
     adk_logger.setLevel(level)
     
     # Configure our package logger
-    package_logger = logging.getLogger("src")
+    package_logger = _PACKAGE_LOGGER
     package_logger.setLevel(level)
     
     # Log configuration
-    package_logger.info(f"Logging configured with level: {logging.getLevelName(level)}")
-    if log_file:
-        package_logger.info(f"Logging to file: {log_file}")
-
+    # Reason: Lazy %-style arguments skip the level-name lookup and formatting
+    # entirely when INFO is filtered out
+    if package_logger.isEnabledFor(logging.INFO):
+        package_logger.info("Logging configured with level: %s", logging.getLevelName(level))
+        if log_file:
+            package_logger.info("Logging to file: %s", log_file)
 
-def get_logger(name: str) -> logging.Logger:
-    """
-    Get a logger with the given name.
-
-    Args:
-        name: The name of the logger.
 
-    Returns:
-        A logger instance.
-    """
-    return logging.getLogger(name)
+# Get a logger with the given name.
+# Reason: An alias rather than a wrapper saves a Python call on every lookup
+get_logger = logging.getLogger
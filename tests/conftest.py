@@ -0,0 +1,144 @@
+"""
+Shared pytest fixtures for the test suite.
+"""
+
+import copy
+import functools
+import os
+import sys
+from contextlib import ExitStack
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+# Project root, computed once for the session
+_ROOT = str(Path(__file__).resolve().parent.parent)
+
+# Reason: pytest.ini's pythonpath already covers normal runs; this keeps src
+# importable when the ini is bypassed, without adding a duplicate entry
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from src.agents import base_agent
+from src.utils import auth
+
+
+# --- Auth fixtures ---
+
+# Reason: Building a MagicMock is comparatively slow, so one template is built per
+# session and shallow-copied per test. Copies share the template's child mocks, so
+# use this only where credentials are an opaque value that tests compare by identity,
+# never one whose attributes a test configures or asserts on.
+_CREDS_TEMPLATE = MagicMock()
+
+
+@pytest.fixture
+def mock_credentials():
+    """Opaque credentials object for tests that only pass it through and compare it."""
+    return copy.copy(_CREDS_TEMPLATE)
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _auth_environment_snapshot():
+    """Restore GOOGLE_APPLICATION_CREDENTIALS once at the end of the session."""
+    # Reason: Snapshotting once per session replaces a save/restore around every
+    # test; tests that change the variable still do so through monkeypatch
+    original_env = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
+    original_attr = auth.GOOGLE_APPLICATION_CREDENTIALS
+    yield
+    if original_env is None:
+        os.environ.pop("GOOGLE_APPLICATION_CREDENTIALS", None)
+    else:
+        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = original_env
+    auth.GOOGLE_APPLICATION_CREDENTIALS = original_attr
+
+
+@pytest.fixture
+def manage_auth_environment(monkeypatch):
+    """Fixture to clear GOOGLE_APPLICATION_CREDENTIALS from the environment and the auth module."""
+    # monkeypatch restores both the env var and the module attribute after the test
+    monkeypatch.delenv("GOOGLE_APPLICATION_CREDENTIALS", raising=False)
+    monkeypatch.setattr(auth, 'GOOGLE_APPLICATION_CREDENTIALS', None, raising=False)
+    yield
+
+
+@pytest.fixture
+def mock_google_auth_default():
+    """Mock google.auth.default."""
+    with patch('src.utils.auth.google.auth.default') as mock_default:
+        yield mock_default
+
+
+@pytest.fixture
+def mock_google_auth_service_creds():
+    """Mock service_account.Credentials.from_service_account_file."""
+    # Reason: Loaded service account credentials are cached, so clear the cache
+    # around each test to keep mocked results from leaking between tests
+    auth._load_service_account_credentials.cache_clear()
+    with patch('src.utils.auth.service_account.Credentials.from_service_account_file') as mock_from_file:
+        yield mock_from_file
+    auth._load_service_account_credentials.cache_clear()
+
+
+@pytest.fixture
+def auth_mocks():
+    """
+    Mock both credential sources of get_credentials in one fixture.
+
+    Yields a namespace with ``service_creds`` (the mocked
+    service_account.Credentials.from_service_account_file) and ``default``
+    (the mocked google.auth.default).
+    """
+    auth._load_service_account_credentials.cache_clear()
+    with ExitStack() as stack:
+        yield SimpleNamespace(
+            service_creds=stack.enter_context(
+                patch('src.utils.auth.service_account.Credentials.from_service_account_file')
+            ),
+            default=stack.enter_context(patch('src.utils.auth.google.auth.default')),
+        )
+    auth._load_service_account_credentials.cache_clear()
+
+
+# --- Agent fixtures ---
+
+@pytest.fixture
+def patched_base_agent_deps(monkeypatch):
+    """
+    Replace the ADK classes BaseAgent builds, and skip config validation.
+
+    Yields a namespace with the ``LlmAgent``, ``Runner`` and
+    ``InMemorySessionService`` mocks installed in src.agents.base_agent.
+    """
+    deps = SimpleNamespace(
+        LlmAgent=MagicMock(), Runner=MagicMock(), InMemorySessionService=MagicMock()
+    )
+    # Reason: monkeypatch swaps plain attributes, avoiding mock.patch's per-target
+    # import and descriptor handling for what is a simple substitution
+    for attr, mock in vars(deps).items():
+        monkeypatch.setattr(base_agent, attr, mock)
+    monkeypatch.setattr(base_agent, 'validate_config', lambda: None)
+    return deps
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_agent(name):
+    """Build a BaseAgent with mocked ADK dependencies once per name."""
+    with patch('src.agents.base_agent.validate_config', return_value=None), \
+         patch('src.agents.base_agent.LlmAgent'), \
+         patch('src.agents.base_agent.Runner'), \
+         patch('src.agents.base_agent.InMemorySessionService'):
+        return base_agent.BaseAgent(name=name)
+
+
+@pytest.fixture(scope="session")
+def shared_agent():
+    """
+    A BaseAgent shared by the whole session.
+
+    Only for tests that call its pure helpers (such as _validate_model or
+    get_final_response) and never configure or assert on its mocked parts.
+    """
+    return _cached_agent("shared")
@@ -2,40 +2,36 @@
 Unit tests for the config module.
 """
 
-import os
-import sys
-import pytest
-from unittest.mock import patch
+import importlib.util
 
-# Add project root to path
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-sys.path.insert(0, project_root)
-
-from importlib import reload # Keep reload for resetting module state if needed, but rely on setattr
 from src import config
+from src.config import get_config, print_config
+
 
+# --- Helpers ---
 
-# --- Fixtures ---
+def _load_isolated_config():
+    """
+    Execute src/config.py as a new, unregistered module.
 
-@pytest.fixture(autouse=True)
-def manage_environment(monkeypatch):
-    """Fixture to reset config module state using reload."""
-    # This ensures each test gets a fresh look at the module,
-    # even though we'll primarily use setattr for specific values.
-    reload(config)
-    yield
-    reload(config) # Reload again after test to clean up
+    The module reads the current environment without replacing or reloading
+    the shared src.config module that other code holds references to.
+    """
+    spec = importlib.util.spec_from_file_location("config_isolated", config.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
 
 # --- Test Cases for validate_config ---
 
-def test_validate_config_non_vertex_with_key(manage_environment, monkeypatch):
+def test_validate_config_non_vertex_with_key(monkeypatch):
     """Test valid config: Non-Vertex AI with API key."""
     monkeypatch.setattr(config, 'USE_VERTEX_AI', False)
     monkeypatch.setattr(config, 'GOOGLE_API_KEY', 'test_api_key')
     assert config.validate_config() is None
 
-def test_validate_config_non_vertex_no_key(manage_environment, monkeypatch):
+def test_validate_config_non_vertex_no_key(monkeypatch):
     """Test invalid config: Non-Vertex AI without API key."""
     monkeypatch.setattr(config, 'USE_VERTEX_AI', False)
     monkeypatch.setattr(config, 'GOOGLE_API_KEY', None) # Explicitly set to None
@@ -43,14 +39,14 @@ def test_validate_config_non_vertex_no_key(manage_environment, monkeypatch):
     assert validation_result is not None
     assert "GOOGLE_API_KEY is required" in validation_result
 
-def test_validate_config_vertex_with_project_region(manage_environment, monkeypatch):
+def test_validate_config_vertex_with_project_region(monkeypatch):
     """Test valid config: Vertex AI with Project ID and Region."""
     monkeypatch.setattr(config, 'USE_VERTEX_AI', True)
     monkeypatch.setattr(config, 'GOOGLE_CLOUD_PROJECT', 'test_project')
     monkeypatch.setattr(config, 'GOOGLE_CLOUD_REGION', 'test_region')
     assert config.validate_config() is None
 
-def test_validate_config_vertex_no_project(manage_environment, monkeypatch):
+def test_validate_config_vertex_no_project(monkeypatch):
     """Test invalid config: Vertex AI without Project ID."""
     monkeypatch.setattr(config, 'USE_VERTEX_AI', True)
     monkeypatch.setattr(config, 'GOOGLE_CLOUD_PROJECT', None) # Explicitly set to None
@@ -59,7 +55,7 @@ def test_validate_config_vertex_no_project(manage_environment, monkeypatch):
     assert validation_result is not None
     assert "GOOGLE_CLOUD_PROJECT is required" in validation_result
 
-def test_validate_config_vertex_no_region(manage_environment, monkeypatch):
+def test_validate_config_vertex_no_region(monkeypatch):
     """Test invalid config: Vertex AI without Region (should pass due to default)."""
     monkeypatch.setattr(config, 'USE_VERTEX_AI', True)
     monkeypatch.setattr(config, 'GOOGLE_CLOUD_PROJECT', 'test_project')
@@ -73,23 +69,19 @@ def test_validate_config_vertex_no_region(manage_environment, monkeypatch):
     assert "GOOGLE_CLOUD_REGION is required" in validation_result
 
 
-# --- Add tests for get_config and print_config if needed ---
-# Example:
-# def test_get_config_values(monkeypatch):
-#     monkeypatch.setenv("GOOGLE_API_KEY", "test_key")
-#     monkeypatch.setenv("WEB_UI_PORT", "9999")
-#     from importlib import reload
-#     from src import config
-#     reload(config)
-#     cfg = config.get_config()
-#     assert cfg["google_api_key"] == "test_key"
-#     assert cfg["web_ui_port"] == 9999
+# --- Test Cases for get_config and print_config ---
+
+def test_get_config_values(monkeypatch):
+    """Test that settings are read from the environment."""
+    monkeypatch.setenv("GOOGLE_API_KEY", "test_key")
+    monkeypatch.setenv("WEB_UI_PORT", "9999")
+    cfg = _load_isolated_config().get_config()
+    assert cfg["google_api_key"] == "test_key"
+    assert cfg["web_ui_port"] == 9999
 
 def test_get_config_includes_all_settings():
     """Test that get_config returns a dictionary with all expected settings."""
-    from src.config import get_config
-    
-    config = get_config()
+    cfg = get_config()
     
     # Check that the config contains all expected keys
     expected_keys = [
@@ -106,7 +98,7 @@ def test_get_config_includes_all_settings():
     ]
     
     for key in expected_keys:
-        assert key in config, f"Expected key '{key}' not found in config"
+        assert key in cfg, f"Expected key '{key}' not found in config"
 
 def test_print_config_masks_api_key(monkeypatch, capsys):
     """Test that print_config masks the API key."""
@@ -115,16 +107,15 @@ def test_print_config_masks_api_key(monkeypatch, capsys):
     monkeypatch.setattr("src.config.GOOGLE_API_KEY", test_api_key)
     
     # Call print_config
-    from src.config import print_config
     print_config()
     
     # Check the output
-    captured = capsys.readouterr()
-    assert "Current Configuration:" in captured.out
+    out = capsys.readouterr().out
+    assert "Current Configuration:" in out
     
     # Check that the API key is masked
-    assert test_api_key not in captured.out
-    assert f"{test_api_key[:5]}...{test_api_key[-5:]}" in captured.out
+    assert test_api_key not in out
+    assert f"{test_api_key[:5]}...{test_api_key[-5:]}" in out
 
 def test_print_config_empty_api_key(monkeypatch, capsys):
     """Test that print_config handles empty API key properly."""
@@ -132,10 +123,9 @@ def test_print_config_empty_api_key(monkeypatch, capsys):
     monkeypatch.setattr("src.config.GOOGLE_API_KEY", None)
     
     # Call print_config
-    from src.config import print_config
     print_config()
     
     # Check the output
-    captured = capsys.readouterr()
-    assert "Current Configuration:" in captured.out
-    assert "google_api_key: None" in captured.out
+    out = capsys.readouterr().out
+    assert "Current Configuration:" in out
+    assert "google_api_key: None" in out
@@ -4,8 +4,6 @@ Unit tests for WebSocket functionality in the local deployment module.
 This module tests the WebSocket endpoints in the local deployment module.
 """
 
-import os
-import sys
 import json
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
@@ -14,10 +12,6 @@ from fastapi import WebSocketDisconnect
 from fastapi.routing import APIRoute
 from starlette.routing import WebSocketRoute
 
-# Add project root to path
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-sys.path.insert(0, project_root)
-
 from src.deployment.local import create_app
 from src.agents.base_agent import BaseAgent
 from google.genai import types
@@ -2,16 +2,13 @@
 Unit tests for the logging utility module.
 """
 
-import os
+import io
 import sys
 import pytest
 import logging
+from logging.handlers import QueueHandler
 from unittest.mock import patch, MagicMock, mock_open, call
 
-# Add project root to path
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-sys.path.insert(0, project_root)
-
 # Import the module to test
 from src.utils import logging as logging_util
 from src import config # To patch DEV_MODE
@@ -29,6 +26,7 @@ def reset_logging_state():
     yield # Run test
 
     # Restore original state
+    logging_util._stop_queue_listener()
     root_logger.handlers = original_handlers
     root_logger.setLevel(original_level)
     # Reset levels for specific loggers if modified (optional, depends on test needs)
@@ -39,15 +37,15 @@ def reset_logging_state():
 # --- Test Cases for configure_logging ---
 
 @patch('src.utils.logging.logging.StreamHandler')
-@patch('src.utils.logging.logging.FileHandler')
+@patch('src.utils.logging.BufferedFileHandler')
 def test_configure_logging_defaults(mock_file_handler, mock_stream_handler, monkeypatch):
     """Test configure_logging with default settings (non-dev mode)."""
     # Configure mock handlers to have a default level
     mock_stream_handler.return_value.level = logging.NOTSET
     mock_file_handler.return_value.level = logging.NOTSET
 
-    # Patch DEV_MODE directly in the logging_util module
-    monkeypatch.setattr(logging_util, 'DEV_MODE', False)
+    # Patch the DEV_MODE-derived default format in the logging_util module
+    monkeypatch.setattr(logging_util, '_DEFAULT_FORMAT', logging_util.DEFAULT_FORMAT)
     # Patch LOG_LEVEL in the config module as it's read within the function
     monkeypatch.setattr(config, 'LOG_LEVEL', 'INFO')
 
@@ -73,14 +71,14 @@ def test_configure_logging_defaults(mock_file_handler, mock_stream_handler, monk
 
 
 @patch('src.utils.logging.logging.StreamHandler')
-@patch('src.utils.logging.logging.FileHandler')
+@patch('src.utils.logging.BufferedFileHandler')
 def test_configure_logging_dev_mode(mock_file_handler, mock_stream_handler, monkeypatch):
     """Test configure_logging with DEV_MODE enabled."""
     mock_stream_handler.return_value.level = logging.NOTSET
     mock_file_handler.return_value.level = logging.NOTSET
 
-    # Patch DEV_MODE directly in the logging_util module
-    monkeypatch.setattr(logging_util, 'DEV_MODE', True)
+    # Patch the DEV_MODE-derived default format in the logging_util module
+    monkeypatch.setattr(logging_util, '_DEFAULT_FORMAT', logging_util.DEV_FORMAT)
     monkeypatch.setattr(config, 'LOG_LEVEL', 'INFO')
 
     logging_util.configure_logging()
@@ -97,14 +95,14 @@ def test_configure_logging_dev_mode(mock_file_handler, mock_stream_handler, monk
 
 
 @patch('src.utils.logging.logging.StreamHandler')
-@patch('src.utils.logging.logging.FileHandler')
+@patch('src.utils.logging.BufferedFileHandler')
 def test_configure_logging_custom_level(mock_file_handler, mock_stream_handler, monkeypatch):
     """Test configure_logging with a custom level (DEBUG)."""
     mock_stream_handler.return_value.level = logging.NOTSET
     mock_file_handler.return_value.level = logging.NOTSET
 
-    # Patch DEV_MODE directly in the logging_util module
-    monkeypatch.setattr(logging_util, 'DEV_MODE', False)
+    # Patch the DEV_MODE-derived default format in the logging_util module
+    monkeypatch.setattr(logging_util, '_DEFAULT_FORMAT', logging_util.DEFAULT_FORMAT)
     # LOG_LEVEL in config is not used when level is passed directly
 
     logging_util.configure_logging(level='DEBUG')
@@ -116,14 +114,14 @@ def test_configure_logging_custom_level(mock_file_handler, mock_stream_handler,
 
 
 @patch('src.utils.logging.logging.StreamHandler')
-@patch('src.utils.logging.logging.FileHandler')
+@patch('src.utils.logging.BufferedFileHandler')
 def test_configure_logging_custom_format(mock_file_handler, mock_stream_handler, monkeypatch):
     """Test configure_logging with a custom format string."""
     mock_stream_handler.return_value.level = logging.NOTSET
     mock_file_handler.return_value.level = logging.NOTSET
 
-    # Patch DEV_MODE directly in the logging_util module
-    monkeypatch.setattr(logging_util, 'DEV_MODE', False)
+    # Patch the DEV_MODE-derived default format in the logging_util module
+    monkeypatch.setattr(logging_util, '_DEFAULT_FORMAT', logging_util.DEFAULT_FORMAT)
     custom_format = "%(levelname)s::%(message)s"
 
     logging_util.configure_logging(format_string=custom_format)
@@ -136,28 +134,25 @@ def test_configure_logging_custom_format(mock_file_handler, mock_stream_handler,
 
 
 @patch('src.utils.logging.logging.StreamHandler')
-@patch('src.utils.logging.logging.FileHandler')
+@patch('src.utils.logging.BufferedFileHandler')
 @patch('src.utils.logging.os.makedirs')
-@patch('src.utils.logging.os.path.exists')
 @patch('builtins.open', new_callable=mock_open) # Mock open for file handler
 def test_configure_logging_with_file(
-    mock_open_call, mock_path_exists, mock_makedirs, mock_file_handler, mock_stream_handler, monkeypatch
+    mock_open_call, mock_makedirs, mock_file_handler, mock_stream_handler, monkeypatch
 ):
     """Test configure_logging with a log file specified."""
     mock_stream_handler.return_value.level = logging.NOTSET
     mock_file_handler.return_value.level = logging.NOTSET
 
-    # Patch DEV_MODE directly in the logging_util module
-    monkeypatch.setattr(logging_util, 'DEV_MODE', False)
+    # Patch the DEV_MODE-derived default format in the logging_util module
+    monkeypatch.setattr(logging_util, '_DEFAULT_FORMAT', logging_util.DEFAULT_FORMAT)
     log_file_path = "/var/log/test_agent.log"
     log_dir = "/var/log"
-    mock_path_exists.return_value = False # Simulate directory doesn't exist
 
     logging_util.configure_logging(log_file=log_file_path)
 
     # Check directory creation
-    mock_path_exists.assert_called_once_with(log_dir)
-    mock_makedirs.assert_called_once_with(log_dir)
+    mock_makedirs.assert_called_once_with(log_dir, exist_ok=True)
 
     # Check FileHandler setup
     mock_file_handler.assert_called_once_with(log_file_path)
@@ -175,33 +170,119 @@ def test_configure_logging_with_file(
 
 
 @patch('src.utils.logging.logging.StreamHandler')
-@patch('src.utils.logging.logging.FileHandler')
-@patch('src.utils.logging.os.makedirs')
-@patch('src.utils.logging.os.path.exists')
-@patch('builtins.open', new_callable=mock_open)
+@patch('src.utils.logging.BufferedFileHandler')
 def test_configure_logging_with_file_dir_exists(
-    mock_open_call, mock_path_exists, mock_makedirs, mock_file_handler, mock_stream_handler, monkeypatch
+    mock_file_handler, mock_stream_handler, monkeypatch, tmp_path
 ):
     """Test configure_logging with a log file where directory exists."""
     mock_stream_handler.return_value.level = logging.NOTSET
     mock_file_handler.return_value.level = logging.NOTSET
 
-    # Patch DEV_MODE directly in the logging_util module
-    monkeypatch.setattr(logging_util, 'DEV_MODE', False)
-    log_file_path = "/var/log/test_agent.log"
-    log_dir = "/var/log"
-    mock_path_exists.return_value = True # Simulate directory exists
+    # Patch the DEV_MODE-derived default format in the logging_util module
+    monkeypatch.setattr(logging_util, '_DEFAULT_FORMAT', logging_util.DEFAULT_FORMAT)
+    log_file_path = str(tmp_path / "test_agent.log")
 
+    # An existing directory must not make directory creation fail
     logging_util.configure_logging(log_file=log_file_path)
 
-    # Check directory creation was NOT called
-    mock_path_exists.assert_called_once_with(log_dir)
-    mock_makedirs.assert_not_called()
-
     # Check FileHandler setup
     mock_file_handler.assert_called_once_with(log_file_path)
 
 
+def test_buffered_file_handler_flushes_on_warning_and_close(tmp_path):
+    """Test that BufferedFileHandler buffers low-severity records until needed."""
+    log_file = tmp_path / "buffered.log"
+    handler = logging_util.BufferedFileHandler(str(log_file))
+    handler.setFormatter(logging.Formatter("%(levelname)s:%(message)s"))
+    logger = logging.getLogger("test_buffered_file_handler")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    try:
+        # The file is not created until the first record is written
+        assert not log_file.exists()
+
+        logger.info("buffered")
+        assert log_file.read_text() == ""
+
+        logger.warning("flushed")
+        assert log_file.read_text() == "INFO:buffered\nWARNING:flushed\n"
+
+        logger.info("on close")
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+    assert log_file.read_text().endswith("INFO:on close\n")
+
+
+@patch('src.utils.logging.logging.StreamHandler')
+def test_configure_logging_repeat_call_is_noop(mock_stream_handler, monkeypatch):
+    """Test that repeating an identical configuration keeps the existing handlers."""
+    mock_stream_handler.return_value.level = logging.NOTSET
+    monkeypatch.setattr(logging_util, '_DEFAULT_FORMAT', logging_util.DEFAULT_FORMAT)
+
+    logging_util.configure_logging(level='INFO')
+    handlers = logging.getLogger().handlers[:]
+    logging_util.configure_logging(level='INFO')
+
+    mock_stream_handler.assert_called_once()
+    assert logging.getLogger().handlers == handlers
+
+
+@patch('src.utils.logging.logging.StreamHandler')
+def test_configure_logging_changed_args_reconfigure(mock_stream_handler, monkeypatch):
+    """Test that a different configuration rebuilds handlers but reuses the formatter."""
+    mock_stream_handler.return_value.level = logging.NOTSET
+    monkeypatch.setattr(logging_util, '_DEFAULT_FORMAT', logging_util.DEFAULT_FORMAT)
+
+    logging_util.configure_logging(level='INFO')
+    logging_util.configure_logging(level='DEBUG')
+
+    assert mock_stream_handler.call_count == 2
+    assert logging.getLogger().level == logging.DEBUG
+    first_formatter, second_formatter = (
+        c[0][0] for c in mock_stream_handler.return_value.setFormatter.call_args_list
+    )
+    assert first_formatter is second_formatter
+
+
+@patch('src.utils.logging.logging.StreamHandler')
+def test_configure_logging_closes_only_its_own_handlers(mock_stream_handler, monkeypatch):
+    """Test that replaced handlers are detached, but only those it installed are closed."""
+    mock_stream_handler.side_effect = lambda stream: MagicMock(level=logging.NOTSET)
+    monkeypatch.setattr(logging_util, '_DEFAULT_FORMAT', logging_util.DEFAULT_FORMAT)
+
+    logging_util.configure_logging(level='INFO')
+    own_handler = logging.getLogger().handlers[0]
+    foreign_handler = MagicMock(level=logging.NOTSET)
+    logging.getLogger().addHandler(foreign_handler)
+
+    logging_util.configure_logging(level='DEBUG')
+
+    own_handler.close.assert_called_once()
+    foreign_handler.close.assert_not_called()
+    assert own_handler not in logging.getLogger().handlers
+    assert foreign_handler not in logging.getLogger().handlers
+
+
+def test_configure_logging_use_queue(monkeypatch):
+    """Test that use_queue routes records through a background listener."""
+    monkeypatch.setattr(logging_util, '_DEFAULT_FORMAT', "%(levelname)s:%(message)s")
+    stream = io.StringIO()
+
+    logging_util.configure_logging(level='INFO', stream=stream, use_queue=True)
+    root_handlers = logging.getLogger().handlers
+    assert len(root_handlers) == 1
+    assert isinstance(root_handlers[0], QueueHandler)
+
+    logging.getLogger("src.test_queue").warning("queued")
+    # Stopping the listener writes out everything still in the queue
+    logging_util._stop_queue_listener()
+
+    assert "WARNING:queued" in stream.getvalue()
+    assert logging_util._QUEUE_LISTENER is None
+
+
 # --- Test for get_logger ---
 
 def test_get_logger():
@@ -4,22 +4,19 @@ Unit tests for the registry module.
 This module contains unit tests for the registry module implementation.
 """
 
-import os
-import sys
 import pytest
 from unittest.mock import patch, MagicMock
 
-# Add the parent directory to the path so we can import the package
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
-
 from src.registry import register_agent_type, get_agent_factory, create_agent, list_agent_types
 
 
 @pytest.fixture
-def clear_registry():
+def clear_registry(monkeypatch):
     """Fixture to clear the registry before each test."""
     from src.registry import _agent_registry
     _agent_registry.clear()
+    # Keep the built-in agent types out of the emptied registry
+    monkeypatch.setattr("src.registry._builtins_registered", True)
     yield
 
 
@@ -129,6 +126,20 @@ def test_list_agent_types(clear_registry, mock_agent_factory):
     assert len(agent_types) == 2
 
 
+def test_builtin_agent_types_registered_on_first_use(monkeypatch):
+    """Test that built-in agent types are registered lazily, exactly once."""
+    from src import registry
+    monkeypatch.setattr(registry, "_agent_registry", {})
+    monkeypatch.setattr(registry, "_builtins_registered", False)
+    
+    # Nothing is registered until the registry is first used
+    assert registry._agent_registry == {}
+    
+    assert list_agent_types() == ["base"]
+    assert get_agent_factory("base") is registry._create_base_agent
+    assert list_agent_types() == ["base"]
+
+
 def test_create_base_agent_with_defaults():
     """Test creating a base agent with default parameters."""
     from src.registry import _create_base_agent